@@ -5,27 +5,161 @@ import logging
 import os
 import sys
 from argparse import ArgumentParser
-from scraping import scrape_glovo, extract_googleMaps, extractDistricts
-from data_preprocessing import preprocess_data, classify_meals, save_final_dataset
-from recommendation_system import generate_user_item_matrix, generate_prediction_df, recommend_meals
+
+# Stage modules pull in pandas, scikit-learn, scipy, googlemaps, geopy, bs4...
+# They are imported inside the stage functions below so that argument parsing
+# and stages that don't need a given dependency stay fast.
+
+GLOVO_FILE = 'glovo_data.csv'
+COMPLETE_FILE = 'complete_data.csv'
+PROCESSED_FILE = 'processed_data.csv'
+FINAL_FILE = 'final_dataset.csv'
+PREDICTIONS_FILE = 'predictions.csv'
+KNOWN_PLACES_FILE = 'known_places.csv'  # Restaurants already resolved on Google Maps, for all cities
+
+API_KEY_PLACEHOLDER = 'Your_key'  # Default --api_key when GOOGLE_MAPS_API_KEY isn't set
+
+STAGES = ['scrape', 'enrich', 'preprocess', 'classify', 'recommend']
 
 def setup_logging():
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def parse_args():
+def build_parser():
     base_dir = os.path.dirname(__file__)  # Gets the directory where the script is located
     parser = ArgumentParser(description="Run the food industry data processing pipeline.")
     parser.add_argument('--city', default='tanger', help='City to process data for.')
-    parser.add_argument('--api_key', default=os.getenv('GOOGLE_MAPS_API_KEY', 'Your_key'), help='Google Maps API key.')
+    parser.add_argument('--api_key', default=os.getenv('GOOGLE_MAPS_API_KEY', API_KEY_PLACEHOLDER), help='Google Maps API key.')
     parser.add_argument('--output_dir', default=os.path.join(base_dir, '..', 'results'), help='Directory to save output files.')
-    return parser.parse_args()
-
-def main():
-    base_dir = os.path.dirname(__file__)  # Gets the directory where the script is located
-    args = parse_args()
+    parser.add_argument('--categories', default=os.path.join(base_dir, '..', 'datasets', 'categories.csv'), help='CSV file with the meal categories training data.')
+    parser.add_argument('--match_threshold', type=float, default=0.6, help='Minimum name similarity to reuse the Google Maps data of a known restaurant.')
+    parser.add_argument('--chunksize', type=int, default=None, help='Stream the preprocess and classify stages through CSV files in chunks of this many rows.')
+
+    subparsers = parser.add_subparsers(dest='stage', metavar='stage', help='Stage to run (runs the whole pipeline when omitted).')
+    subparsers.add_parser('scrape', help='Scrape restaurants and meals from Glovo.')
+    subparsers.add_parser('enrich', help='Add Google Maps data and districts to the scraped restaurants.')
+    subparsers.add_parser('preprocess', help='Clean prices and compute composite ratings.')
+    subparsers.add_parser('classify', help='Predict the category of each meal.')
+    subparsers.add_parser('recommend', help='Generate meal recommendations.')
+    return parser
+
+def parse_args(argv=None):
+    return build_parser().parse_args(argv)
+
+def read_stage_input(args, file_name):
+    import pandas as pd
+
+    path = os.path.join(args.output_dir, file_name)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} not found, run the previous stage first.")
+    return pd.read_csv(path)
+
+def run_scrape(args, data=None):
+    from scraping import scrape_glovo
+
+    logging.info("Starting data collection...")
+    df_glovo = scrape_glovo(args.city)
+    df_glovo.to_csv(os.path.join(args.output_dir, GLOVO_FILE), index=False)
+    return df_glovo
+
+def update_known_places(args, df_maps):
+    import pandas as pd
+    from restaurant_matching import PLACE_COLUMNS
+    from scraping import PLACES_API_SOURCE
+
+    # Only keep actual Places API results, so that a wrong fuzzy match isn't stored as a known restaurant
+    new_places = df_maps.loc[df_maps['Source'] == PLACES_API_SOURCE, ['Restaurant'] + PLACE_COLUMNS + ['City']]
+    if new_places.empty:
+        return
+
+    path = os.path.join(args.output_dir, KNOWN_PLACES_FILE)
+    known_places = pd.read_csv(path) if os.path.exists(path) else pd.DataFrame()
+    known_places = pd.concat([known_places, new_places], ignore_index=True)
+    known_places = known_places.drop_duplicates(subset=['Restaurant', 'City'], keep='last')
+    known_places.to_csv(path, index=False)
+
+def load_name_index(args):
+    import pandas as pd
+    from restaurant_matching import build_name_index
+
+    path = os.path.join(args.output_dir, KNOWN_PLACES_FILE)
+    if not os.path.exists(path):
+        return None
+    known_places = pd.read_csv(path)
+    known_places = known_places[known_places['City'] == args.city.upper()]
+    return build_name_index(known_places) if not known_places.empty else None
+
+def run_enrich(args, data=None):
+    from scraping import extract_googleMaps, extractDistricts
+
+    df_glovo = data if data is not None else read_stage_input(args, GLOVO_FILE)
+    logging.info("Fetching Google Maps data...")
+    df_maps = extract_googleMaps(df_glovo, args.city, args.api_key, load_name_index(args), args.match_threshold)
+    if not df_maps.empty:
+        update_known_places(args, df_maps)
+    df_maps = extractDistricts(df_maps)
+    df_complete = df_glovo.merge(df_maps, on='Restaurant', how='left')
+    df_complete.to_csv(os.path.join(args.output_dir, COMPLETE_FILE), index=False)
+    return df_complete
+
+def run_preprocess(args, data=None):
+    from data_preprocessing import preprocess_data, preprocess_data_chunked, save_final_dataset
+
+    if args.chunksize:
+        logging.info(f"Preprocessing data in chunks of {args.chunksize} rows...")
+        preprocess_data_chunked(os.path.join(args.output_dir, COMPLETE_FILE),
+                                os.path.join(args.output_dir, PROCESSED_FILE), args.chunksize)
+        return None
+
+    df_complete = data if data is not None else read_stage_input(args, COMPLETE_FILE)
+    logging.info("Preprocessing data...")
+    processed_data = preprocess_data(df_complete)
+    save_final_dataset(processed_data, os.path.join(args.output_dir, PROCESSED_FILE))
+    return processed_data
+
+def run_classify(args, data=None):
+    from data_preprocessing import classify_meals, classify_meals_chunked, save_final_dataset
+
+    if args.chunksize:
+        logging.info(f"Classifying meals in chunks of {args.chunksize} rows...")
+        final_data_path = os.path.join(args.output_dir, FINAL_FILE)
+        classify_meals_chunked(os.path.join(args.output_dir, PROCESSED_FILE), final_data_path,
+                               args.categories, args.chunksize)
+        logging.info(f"Final dataset saved at {final_data_path}")
+        return None
+
+    processed_data = data if data is not None else read_stage_input(args, PROCESSED_FILE)
+    logging.info("Classifying meals...")
+    final_data = classify_meals(processed_data, args.categories)
+    final_data_path = os.path.join(args.output_dir, FINAL_FILE)
+    save_final_dataset(final_data, final_data_path)
+    logging.info(f"Final dataset saved at {final_data_path}")
+    return final_data
+
+def run_recommend(args, data=None):
+    from recommendation_system import recommend_meals
+
+    final_data = data if data is not None else read_stage_input(args, FINAL_FILE)
+    logging.info("Genrating the recommendation system...")
+    predictions = recommend_meals(final_data)
+    predictions_path = os.path.join(args.output_dir, PREDICTIONS_FILE)
+    predictions.to_csv(predictions_path)
+    logging.info(f"Recommendations saved at {predictions_path}")
+    return predictions
+
+STAGE_RUNNERS = {
+    'scrape': run_scrape,
+    'enrich': run_enrich,
+    'preprocess': run_preprocess,
+    'classify': run_classify,
+    'recommend': run_recommend,
+}
+
+def main(argv=None):
+    args = parse_args(argv)
     setup_logging()
 
-    if args.api_key == 'Your_Google_Maps_API_Key':
+    stages = [args.stage] if args.stage else STAGES
+    if 'enrich' in stages and args.api_key == API_KEY_PLACEHOLDER:
         logging.error("Google Maps API key not provided.")
         sys.exit(1)
 
@@ -33,32 +167,11 @@ def main():
         os.makedirs(args.output_dir)
 
     try:
-        logging.info("Starting data collection...")
-        df_glovo = scrape_glovo(args.city)
-        df_maps = extract_googleMaps(df_glovo, args.city, args.api_key)
-        df_complete = extractDistricts(df_maps)
-
-        logging.info("Preprocessing data...")
-        processed_data = preprocess_data(df_complete)
-
-        logging.info("Classifying meals...")
-        final_data = classify_meals(processed_data, os.path.join(base_dir, '..', 'datasets', 'categories.csv'))
-
-        final_data_path = os.path.join(args.output_dir, 'final_dataset.csv')
-        save_final_dataset(final_data, final_data_path)
-        logging.info(f"Final dataset saved at {final_data_path}")
-
-
-        processed_data = preprocess_data(df_complete)
-        final_data = classify_meals(processed_data, os.path.join(base_dir, '..', 'datasets', 'categories.csv'))
-
-        logging.info("Genrating the recommendation system...")
-        predictions = recommend_meals(final_data)
-        predictions_path = os.path.join(args.output_dir, 'predictions.csv')
-        predictions.to_csv(predictions_path)
-        logging.info(f"Recommendations saved at {predictions_path}")
-
-
+        # Each stage's output is passed to the next in memory
+        # (chunked stages return None, so the next stage reads their output file)
+        data = None
+        for stage in stages:
+            data = STAGE_RUNNERS[stage](args, data)
     except Exception as e:
         logging.error(f"An error occurred: {e}")
         sys.exit(1)
@@ -3,11 +3,6 @@
 
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
 from helpers import clean_price, clean_percentage
 
 
@@ -72,6 +67,49 @@ def preprocess_data(final_data):
     return final_data
 
 
+def train_meal_classifier(categories_file_path):
+    """
+    Trains the meal classifier on the provided training data.
+
+    Parameters:
+    categories_file_path (str): Path to the CSV file containing the training data.
+
+    Returns:
+    tuple: The fitted TfidfVectorizer and LogisticRegression classifier.
+    """
+    # scikit-learn is imported here rather than at module level so that the
+    # other stages (and the CLI) don't pay its import cost.
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import accuracy_score
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+
+    # Load training data
+    meal_category = pd.read_csv(categories_file_path, encoding='utf-8', sep=';')
+    categories = meal_category['Type']
+    meals = meal_category['Plat']
+
+    # Prepare the data
+    X_train, X_test, y_train, y_test = train_test_split(meals, categories, test_size=0.2, random_state=42)
+    vectorizer = TfidfVectorizer()
+    X_train_vec = vectorizer.fit_transform(X_train)
+    X_test_vec = vectorizer.transform(X_test)
+
+    # Train classifier
+    classifier = RandomForestClassifier()
+    classifier.fit(X_train_vec, y_train)
+    accuracy = accuracy_score(y_test, classifier.predict(X_test_vec))
+    print("Classifier test accuracy:", accuracy)
+
+    # Train the final classifier
+    X_vect = vectorizer.fit_transform(meals)
+    classifier = LogisticRegression()
+    classifier.fit(X_vect, categories)
+
+    return vectorizer, classifier
+
+
 def classify_meals(final_data, categories_file_path):
     """
     Classifies meals based on the provided training data.
@@ -84,26 +122,7 @@ def classify_meals(final_data, categories_file_path):
     DataFrame: The classified data.
     """
     try:
-        # Load training data
-        meal_category = pd.read_csv(categories_file_path, encoding='utf-8', sep=';')
-        categories = meal_category['Type']
-        meals = meal_category['Plat']
-
-        # Prepare the data
-        X_train, X_test, y_train, y_test = train_test_split(meals, categories, test_size=0.2, random_state=42)
-        vectorizer = TfidfVectorizer()
-        X_train_vec = vectorizer.fit_transform(X_train)
-        X_test_vec = vectorizer.transform(X_test)
-
-        # Train classifier
-        classifier = RandomForestClassifier()
-        classifier.fit(X_train_vec, y_train)
-        accuracy = accuracy_score(y_test, classifier.predict(X_test_vec))
-
-        # Train the final classifier
-        X_vect = vectorizer.fit_transform(meals)
-        classifier = LogisticRegression()
-        classifier.fit(X_vect, categories)
+        vectorizer, classifier = train_meal_classifier(categories_file_path)
 
         # Predict the categories for final_data
         df_categories = pd.DataFrame(columns=['Meal name', 'Category'])
@@ -121,6 +140,153 @@ def classify_meals(final_data, categories_file_path):
         print(f"Error in classifying meals: {e}")
         return pd.DataFrame()
 
+
+def drop_seen_duplicates(chunk, seen):
+    """
+    Drops the rows of a chunk whose ('Restaurant', 'Meal name') pair was already seen,
+    in this chunk or a previous one. Only a 64-bit hash of each pair is kept, in a sorted
+    numpy array, so memory grows by 8 bytes per distinct pair.
+
+    Parameters:
+    chunk (DataFrame): The chunk to deduplicate.
+    seen (ndarray): Sorted uint64 hashes of the pairs seen so far.
+
+    Returns:
+    tuple: The rows of the chunk seen for the first time, and the updated hashes.
+    """
+    # Hash the text of the values so that e.g. 123 and '123' give the same hash
+    hashes = pd.util.hash_pandas_object(chunk[['Restaurant', 'Meal name']].astype(str), index=False).values
+
+    # First occurrence of each pair in the chunk, then only the pairs not seen in previous chunks
+    unique_hashes, first_rows = np.unique(hashes, return_index=True)
+    positions = np.searchsorted(seen, unique_hashes)
+    already_seen = np.zeros(len(unique_hashes), dtype=bool)
+    if len(seen):
+        already_seen = seen[np.minimum(positions, len(seen) - 1)] == unique_hashes
+
+    keep = np.zeros(len(chunk), dtype=bool)
+    keep[first_rows[~already_seen]] = True
+    seen = np.insert(seen, positions[~already_seen], unique_hashes[~already_seen])
+    return chunk[keep], seen
+
+
+def preprocess_chunk(chunk):
+    """
+    Applies the preprocess_data cleaning steps to a single chunk: price conversion,
+    composite rating and missing coordinates.
+
+    Parameters:
+    chunk (DataFrame): A chunk of the dataset containing restaurant information.
+
+    Returns:
+    DataFrame: The preprocessed chunk.
+    """
+    chunk['Price'] = chunk['Price'].fillna('').apply(clean_price)
+    chunk = chunk.dropna(subset=['Price'])
+
+    # Replace '--' with NaN in the entire chunk
+    chunk = chunk.replace('--', np.nan)
+
+    # to_numeric keeps the ratings numeric when the chunk is empty
+    glovo_rating = pd.to_numeric(chunk['Rating glovo'].apply(clean_percentage), errors='coerce')
+    if 'Rating google' in chunk:
+        google_rating = pd.to_numeric(chunk['Rating google'], errors='coerce')
+    else:
+        google_rating = pd.Series(np.nan, index=chunk.index)
+    # Mean of the available ratings: one of them if the other is missing, NaN if both are
+    chunk = chunk.assign(Rating=pd.concat([glovo_rating, google_rating], axis=1).mean(axis=1))
+    chunk = chunk.drop(columns=['Rating glovo', 'Rating google'], errors='ignore')
+
+    return chunk.dropna(axis='index', subset=['Latitude', 'Longitude'])
+
+
+# Read the deduplication keys as text in every chunk, whatever their values look like
+KEY_DTYPES = {'Restaurant': str, 'Meal name': str}
+
+
+def stream_csv(input_path, output_path, process_chunk, chunksize, **read_kwargs):
+    """
+    Reads a CSV file in chunks, processes each chunk and appends it to the output CSV file,
+    so that only one chunk is held in memory at a time.
+
+    Parameters:
+    input_path (str): The CSV file to read.
+    output_path (str): The CSV file to write.
+    process_chunk (callable): Function taking and returning a DataFrame chunk.
+    chunksize (int): Number of rows read per chunk.
+    read_kwargs: Extra arguments passed to pandas.read_csv.
+
+    Returns:
+    int: The number of rows written.
+    """
+    rows_read = 0
+    rows_written = 0
+    first_chunk = True
+    for chunk in pd.read_csv(input_path, chunksize=chunksize, **read_kwargs):
+        rows_read += len(chunk)
+        chunk = process_chunk(chunk)
+        # The first chunk creates the file and writes the header, the next ones are appended
+        chunk.to_csv(output_path, mode='w' if first_chunk else 'a', header=first_chunk, index=False)
+        first_chunk = False
+        rows_written += len(chunk)
+    print(f"Rows read: {rows_read}, rows written to {output_path}: {rows_written}")
+    return rows_written
+
+
+def preprocess_data_chunked(input_path, output_path, chunksize=100000):
+    """
+    Out-of-core version of preprocess_data for datasets that don't fit in memory.
+    Rows are streamed from `input_path` to `output_path` in chunks of `chunksize` rows.
+    Unlike preprocess_data, the first occurrence of a ('Restaurant', 'Meal name') pair is kept,
+    and rows with missing coordinates are dropped before deduplication.
+
+    Parameters:
+    input_path (str): CSV file containing restaurant information.
+    output_path (str): CSV file where the preprocessed data is written.
+    chunksize (int): Number of rows processed at a time.
+
+    Returns:
+    int: The number of rows written.
+    """
+    seen = np.empty(0, dtype=np.uint64)
+
+    def process_chunk(chunk):
+        nonlocal seen
+        # Missing coordinates are dropped first, so that a pair isn't marked as seen by a row that is dropped
+        chunk, seen = drop_seen_duplicates(preprocess_chunk(chunk), seen)
+        return chunk
+
+    return stream_csv(input_path, output_path, process_chunk, chunksize,
+                      dtype={**KEY_DTYPES, 'Price': str, 'Rating glovo': str})
+
+
+def classify_meals_chunked(input_path, output_path, categories_file_path, chunksize=100000):
+    """
+    Out-of-core version of classify_meals: the classifier is trained once, then the meals
+    are streamed from `input_path` to `output_path` in chunks of `chunksize` rows.
+
+    Parameters:
+    input_path (str): CSV file containing the preprocessed data.
+    output_path (str): CSV file where the classified data is written.
+    categories_file_path (str): Path to the CSV file containing the training data.
+    chunksize (int): Number of rows processed at a time.
+
+    Returns:
+    int: The number of rows written.
+    """
+    vectorizer, classifier = train_meal_classifier(categories_file_path)
+    seen = np.empty(0, dtype=np.uint64)
+
+    def classify_chunk(chunk):
+        nonlocal seen
+        chunk, seen = drop_seen_duplicates(chunk, seen)
+        if chunk.empty:
+            return chunk.assign(Category=pd.Series(dtype=object))
+        return chunk.assign(Category=classifier.predict(vectorizer.transform(chunk['Meal name'].astype(str))))
+
+    return stream_csv(input_path, output_path, classify_chunk, chunksize, dtype=KEY_DTYPES)
+
+
 def save_final_dataset(final_data, output_path):
     """
     Saves the final dataset to a CSV file.
@@ -1,7 +1,6 @@
 #!/usr/bin/env python
 # coding: utf-8
 
-from bs4 import BeautifulSoup
 import numpy as np
 import pandas as pd  # Ensure pandas is imported for DataFrame operations.
 
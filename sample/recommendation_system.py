@@ -1,7 +1,5 @@
 import pandas as pd
 import numpy as np
-from scipy.sparse import csr_matrix
-from scipy.sparse.linalg import svds
 import random
 
 def simulate_user_ratings(final_data):
@@ -49,6 +47,9 @@ def generate_prediction_df(user_item_matrix, n_factors=10):
     Returns:
     DataFrame: Predicted ratings DataFrame.
     """
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.linalg import svds
+
     mat = csr_matrix(user_item_matrix.fillna(0).values)  # Fill NA with 0 and convert to CSR matrix
 
     if not 1 <= n_factors < min(mat.shape):
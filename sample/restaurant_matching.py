@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import re
+import time
+import unicodedata
+import numpy as np
+import pandas as pd
+
+# Google Maps data stored for each resolved restaurant (see scraping.extract_googleMaps)
+PLACE_COLUMNS = ['Address', 'Latitude', 'Longitude', 'Rating google', 'Number of reviews']
+
+# Words that don't help telling restaurants apart
+STOP_WORDS = {'restaurant', 'resto', 'snack', 'the', 'le', 'la', 'les', 'chez', 'de', 'du', 'des'}
+
+DEFAULT_THRESHOLD = 0.6
+
+
+def normalize_name(name):
+    """
+    Normalizes a restaurant name: lowercase, no accents, no punctuation and no stop words.
+
+    Parameters:
+    name (str): The restaurant name.
+
+    Returns:
+    str: The normalized name.
+    """
+    name = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii').lower()
+    name = re.sub(r"['’`]", '', name)  # "McDonald's" and "McDonalds" are the same restaurant
+    words = re.sub(r'[^a-z0-9]+', ' ', name).split()
+    return ' '.join(word for word in words if word not in STOP_WORDS) or ' '.join(words)
+
+
+def word_spans(words):
+    """
+    Returns the words of a name, alone and merged with their following words.
+
+    Parameters:
+    words (list): Words of a normalized name.
+
+    Returns:
+    list: ((start, end), merged words) for each span of consecutive words.
+    """
+    return [((start, end), ''.join(words[start:end]))
+            for start in range(len(words)) for end in range(start + 1, len(words) + 1)]
+
+
+def missing_words(words, other_words):
+    """
+    Finds the words that aren't words of the other name. Consecutive words are compared
+    merged on both sides, so that "mc donalds" and "mcdonalds", or "k f c" and "kfc", match,
+    but a word is never found inside a longer one ("dar" isn't in "darhamid").
+
+    Parameters:
+    words (list): Words of a normalized name.
+    other_words (list): Words of the other normalized name.
+
+    Returns:
+    set: The words missing from the other name.
+    """
+    other_spans = {merged for _, merged in word_spans(other_words)}
+    found = [False] * len(words)
+    for (start, end), merged in word_spans(words):
+        if merged in other_spans:
+            found[start:end] = [True] * (end - start)
+    return {word for word, is_found in zip(words, found) if not is_found}
+
+
+def is_compatible(name, candidate, city=None):
+    """
+    Checks that two normalized names have the same distinguishing words, so that neither
+    another branch of a known chain ("Burger King Centre" for "Burger King Marina") nor a
+    branch picked from a generic name ("KFC" for "KFC Marjane") is matched. The city isn't
+    distinguishing.
+
+    Parameters:
+    name (str): The normalized name to match.
+    candidate (str): The normalized name of the known restaurant.
+    city (str): Optional city name, ignored in the comparison.
+
+    Returns:
+    bool: Whether the candidate can be the same restaurant.
+    """
+    ignored = set(normalize_name(city).split()) if city else set()
+    name_words = [word for word in name.split() if word not in ignored]
+    candidate_words = [word for word in candidate.split() if word not in ignored]
+    return not missing_words(name_words, candidate_words) and not missing_words(candidate_words, name_words)
+
+
+def build_name_index(known_places):
+    """
+    Builds a character n-gram TF-IDF index of previously resolved restaurants.
+
+    Parameters:
+    known_places (DataFrame): Restaurants already resolved on Google Maps, with a 'Restaurant'
+    column and the Google Maps data in PLACE_COLUMNS.
+
+    Returns:
+    tuple: The fitted TfidfVectorizer, the TF-IDF matrix of the known names and the
+    DataFrame of known places (one row per restaurant, in the same order as the matrix).
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    places = known_places.dropna(subset=['Restaurant']).drop_duplicates(subset=['Restaurant'], keep='last')
+    places = places.reset_index(drop=True)
+    vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 4), sublinear_tf=True)
+    matrix = vectorizer.fit_transform(places['Restaurant'].apply(normalize_name))
+    return vectorizer, matrix, places
+
+
+def match_restaurants(names, name_index, threshold=DEFAULT_THRESHOLD, city=None, batch_size=1000):
+    """
+    Matches restaurant names against the known restaurants of the index. The names are
+    vectorized and compared in batches; TF-IDF rows are L2-normalized, so their dot
+    product is the cosine similarity. A name is only matched if exactly one known restaurant
+    reaches the threshold and is compatible with it (see is_compatible): when several are,
+    the name is ambiguous and left unmatched.
+
+    Parameters:
+    names (list): Restaurant names to match.
+    name_index (tuple): Index returned by build_name_index.
+    threshold (float): Minimum cosine similarity for a name to be matched.
+    city (str): Optional city of the restaurants, not used to tell them apart.
+    batch_size (int): Number of names compared at a time.
+
+    Returns:
+    DataFrame: For each name, the matched known restaurant (NaN if none or several are
+    similar and compatible) and the similarity of the closest known restaurant.
+    """
+    vectorizer, matrix, places = name_index
+    names = list(names)
+    known_names = places['Restaurant'].apply(normalize_name).values
+    matched = np.full(len(names), np.nan, dtype=object)
+    best_similarities = np.zeros(len(names))
+
+    for start in range(0, len(names), batch_size):
+        batch = [normalize_name(name) for name in names[start:start + batch_size]]
+        similarities = vectorizer.transform(batch).dot(matrix.T).tocsr()
+        for i, name in enumerate(batch):
+            row = slice(similarities.indptr[i], similarities.indptr[i + 1])
+            rows, values = similarities.indices[row], similarities.data[row]
+            if len(values):
+                best_similarities[start + i] = values.max()
+            candidates = [j for j in rows[values >= threshold] if is_compatible(name, known_names[j], city)]
+            if len(candidates) == 1:
+                matched[start + i] = places['Restaurant'].iat[candidates[0]]
+
+    return pd.DataFrame({'Restaurant': names, 'Matched restaurant': matched, 'Similarity': best_similarities})
+
+
+def resolve_known_places(names, name_index, threshold=DEFAULT_THRESHOLD, city=None):
+    """
+    Looks up the Google Maps data of the names matching a known restaurant.
+
+    Parameters:
+    names (list): Restaurant names to resolve.
+    name_index (tuple): Index returned by build_name_index.
+    threshold (float): Minimum cosine similarity for a name to be matched.
+    city (str): Optional city of the restaurants, not used to tell them apart.
+
+    Returns:
+    dict: Maps each resolved name to the row (Series) of its known place.
+    """
+    places = name_index[2].set_index('Restaurant')
+    matches = match_restaurants(names, name_index, threshold, city).dropna(subset=['Matched restaurant'])
+    return {row['Restaurant']: places.loc[row['Matched restaurant']] for _, row in matches.iterrows()}
+
+
+def evaluate_matching(labelled, name_index, threshold=DEFAULT_THRESHOLD, city=None):
+    """
+    Measures the matching throughput and accuracy on a labelled set of names.
+
+    Parameters:
+    labelled (DataFrame): Names to match in 'Restaurant', and the known restaurant they
+    should match in 'Expected' (NaN when they shouldn't match any).
+    name_index (tuple): Index returned by build_name_index.
+    threshold (float): Minimum cosine similarity for a name to be matched.
+    city (str): Optional city of the restaurants, not used to tell them apart.
+
+    Returns:
+    dict: The number of names, the number of matched names, the throughput in names per
+    second and the accuracy.
+    """
+    start = time.perf_counter()
+    matches = match_restaurants(labelled['Restaurant'], name_index, threshold, city)
+    elapsed = time.perf_counter() - start
+
+    expected = labelled['Expected'].fillna('').values
+    predicted = matches['Matched restaurant'].fillna('').values
+    return {
+        'names': len(labelled),
+        'matched': int(matches['Matched restaurant'].notna().sum()),
+        'throughput': len(labelled) / elapsed if elapsed else float('inf'),
+        'accuracy': float((expected == predicted).mean()) if len(labelled) else float('nan'),
+    }
@@ -1,14 +1,17 @@
 #!/usr/bin/env python
 # coding: utf-8
 
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 from helpers import extract_data
+from restaurant_matching import resolve_known_places, DEFAULT_THRESHOLD
 import time 
-from geopy.geocoders import Nominatim
-import googlemaps
-from tqdm import tqdm
+
+# requests, bs4, googlemaps, tqdm and geopy are imported inside the functions that use
+# them, so that each stage only loads its own dependencies.
+
+# Values of the 'Source' column added by extract_googleMaps
+PLACES_API_SOURCE = 'Places API'
+NAME_INDEX_SOURCE = 'Name index'
 
 def scrape_glovo(city):
     """
@@ -20,6 +23,10 @@ def scrape_glovo(city):
     Returns:
     A DataFrame containing all the scraped data from Glovo.
     """
+    import requests
+    from bs4 import BeautifulSoup
+    from tqdm import tqdm
+
     session = requests.Session()
     url = f'https://glovoapp.com/ma/fr/{city}/restaurants_1/'
     content = session.get(url).text
@@ -43,7 +50,7 @@ def scrape_glovo(city):
 
     return df_glovo
 
-def extract_googleMaps(df, city, api_key):
+def extract_googleMaps(df, city, api_key, name_index=None, threshold=DEFAULT_THRESHOLD):
     """
     Extracts Google Maps data for each restaurant in the DataFrame.
 
@@ -51,16 +58,45 @@ def extract_googleMaps(df, city, api_key):
     df: DataFrame containing restaurant data.
     city: City name to append to restaurant names for Google Maps searching.
     api_key: Google Maps API key.
+    name_index: Optional index of previously resolved restaurants (see restaurant_matching.build_name_index).
+    Restaurants whose name is similar enough to a known one reuse its data instead of calling the API.
+    threshold: Minimum name similarity for a restaurant to be resolved from the index.
 
     Returns:
-    DataFrame with added Google Maps data including latitude, longitude, and ratings.
+    DataFrame with added Google Maps data including latitude, longitude, and ratings. The 'Source'
+    column tells whether each row comes from the Places API or from the name index.
     """
-    gmaps = googlemaps.Client(key=api_key)
+    import googlemaps
+    from tqdm import tqdm
+
+    restaurants = df['Restaurant'].unique()
+    known_places = {}
+    if name_index is not None:
+        known_places = resolve_known_places(restaurants, name_index, threshold, city)
+        print(f"Resolved {len(known_places)}/{len(restaurants)} restaurants from the name index")
+
+    gmaps = None
     restaurant_info = pd.DataFrame()
-    for restaurant in tqdm(df['Restaurant'].unique(), desc="Fetching Google Maps data"):
-        place_name = f"{restaurant} {city}"
-        place_result = gmaps.places(place_name)
-        if place_result['results']:
+    for restaurant in tqdm(restaurants, desc="Fetching Google Maps data"):
+        if restaurant in known_places:
+            place = known_places[restaurant]
+            data = {
+                'Restaurant': [restaurant],
+                'Address': [place['Address']],
+                'Latitude': [place['Latitude']],
+                'Longitude': [place['Longitude']],
+                'Rating google': [place['Rating google']],
+                'Number of reviews': [place['Number of reviews']],
+                'City': [city.upper()],
+                'Source': [NAME_INDEX_SOURCE]
+            }
+        else:
+            if gmaps is None:  # Only create the client when an API call is actually needed
+                gmaps = googlemaps.Client(key=api_key)
+            place_name = f"{restaurant} {city}"
+            place_result = gmaps.places(place_name)
+            if not place_result['results']:
+                continue
             result = place_result['results'][0]
             data = {
                 'Restaurant': [restaurant],
@@ -69,9 +105,10 @@ def extract_googleMaps(df, city, api_key):
                 'Longitude': [result['geometry']['location']['lng']],
                 'Rating google': [result.get('rating', None)],
                 'Number of reviews': [result.get('user_ratings_total', None)],
-                'City': [city.upper()]
+                'City': [city.upper()],
+                'Source': [PLACES_API_SOURCE]
             }
-            restaurant_info = pd.concat([restaurant_info, pd.DataFrame(data)], ignore_index=True)
+        restaurant_info = pd.concat([restaurant_info, pd.DataFrame(data)], ignore_index=True)
     return restaurant_info
 
 def extractDistricts(df):
@@ -84,6 +121,9 @@ def extractDistricts(df):
     Returns:
     DataFrame with district information added.
     """
+    from geopy.geocoders import Nominatim
+    from tqdm import tqdm
+
     geolocator = Nominatim(user_agent="my_app")
     tqdm.pandas(desc="Extracting Districts")  # Initialize tqdm for pandas apply
     
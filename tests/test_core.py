@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+import subprocess
+import tempfile
+from unittest.mock import patch
+
+SAMPLE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sample'))
+
+# Append the directory of your helpers module to Python's search path
+sys.path.append(SAMPLE_DIR)
+from core import parse_args, main, update_known_places, STAGES, API_KEY_PLACEHOLDER, KNOWN_PLACES_FILE
+
+# Cumulative import time allowed for the CLI, in microseconds
+IMPORT_TIME_BUDGET = 200000
+
+HEAVY_MODULES = ['pandas', 'sklearn', 'scipy', 'googlemaps', 'geopy', 'bs4', 'tqdm']
+
+def import_times(code):
+    """
+    Runs `code` in a fresh interpreter with `-X importtime` and returns a dict
+    mapping each imported module to its cumulative import time in microseconds.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=SAMPLE_DIR, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line.split('|')
+        times[module.strip()] = int(cumulative)
+    return times
+
+class TestCore(unittest.TestCase):
+
+    def test_parse_args_stage(self):
+        for stage in STAGES:
+            self.assertEqual(parse_args([stage]).stage, stage)
+
+    def test_parse_args_whole_pipeline(self):
+        args = parse_args(['--city', 'rabat'])
+        self.assertIsNone(args.stage)
+        self.assertEqual(args.city, 'rabat')
+
+    def test_cli_startup_skips_heavy_imports(self):
+        """Parsing arguments must not import any of the stage dependencies."""
+        times = import_times("import core; core.parse_args(['recommend'])")
+        self.assertIn('core', times)
+        self.assertLess(times['core'], IMPORT_TIME_BUDGET)
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, times)
+
+    @patch('core.run_scrape')
+    def test_missing_api_key_exits_before_scraping(self, mock_scrape):
+        """The whole pipeline stops before scraping when the Google Maps API key is missing."""
+        with tempfile.TemporaryDirectory() as output_dir:
+            with self.assertRaises(SystemExit):
+                main(['--api_key', API_KEY_PLACEHOLDER, '--output_dir', output_dir])
+        self.assertFalse(mock_scrape.called)
+
+    def test_update_known_places_api_results_only(self):
+        """Restaurants resolved from the name index aren't stored as known restaurants."""
+        import pandas as pd
+        df_maps = pd.DataFrame({'Restaurant': ['Cafe Hafa', 'Café Hafa'], 'Address': ['1 Hafa St'] * 2,
+                                'Latitude': [35.79] * 2, 'Longitude': [-5.82] * 2, 'Rating google': [4.4] * 2,
+                                'Number of reviews': [900] * 2, 'City': ['TANGER'] * 2,
+                                'Source': ['Name index', 'Places API']})
+        with tempfile.TemporaryDirectory() as output_dir:
+            update_known_places(parse_args(['--output_dir', output_dir]), df_maps)
+            known_places = pd.read_csv(os.path.join(output_dir, KNOWN_PLACES_FILE))
+        self.assertEqual(list(known_places['Restaurant']), ['Café Hafa'])
+
+    def test_scraping_skips_stage_dependencies(self):
+        """The scraping module alone loads neither the scraping nor the Google Maps clients."""
+        times = import_times("import scraping")
+        for module in ['requests', 'bs4', 'googlemaps', 'tqdm', 'geopy', 'sklearn']:
+            self.assertNotIn(module, times)
+
+    def test_preprocess_skips_sklearn(self):
+        """The preprocessing stage alone should not load scikit-learn."""
+        times = import_times("import data_preprocessing")
+        self.assertNotIn('sklearn', times)
+
+if __name__ == '__main__':
+    unittest.main()
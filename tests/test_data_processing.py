@@ -4,11 +4,15 @@ import os
 from bs4 import BeautifulSoup
 import pandas as pd
 import numpy as np
+import tempfile
+import tracemalloc
 
 # Append the directory of your helpers module to Python's search path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sample')))
 
-from data_preprocessing import preprocess_data, classify_meals
+from data_preprocessing import preprocess_data, classify_meals, preprocess_data_chunked, classify_meals_chunked
+
+CATEGORIES_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'datasets', 'categories.csv'))
 
 class TestDataProcessing(unittest.TestCase):
 
@@ -67,5 +71,161 @@ class TestDataProcessing(unittest.TestCase):
         classified_data = classify_meals(processed_data, 'path_to_categories.csv')
         self.assertIn('Category', classified_data.columns)
 
+class TestChunkedProcessing(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.tmp_dir.name, 'complete_data.csv')
+        self.processed_path = os.path.join(self.tmp_dir.name, 'processed_data.csv')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_input(self, n_rows, n_meals=1000):
+        """Writes a dump of `n_rows` rows cycling over `n_meals` (Restaurant, Meal name) pairs."""
+        meal_ids = np.arange(n_rows) % n_meals
+        pd.DataFrame({
+            'Restaurant': [f'R{i % 50}' for i in meal_ids],
+            'Meal name': [f'Tacos au poulet {i}' for i in meal_ids],
+            'Price': ['45,00 MAD'] * n_rows,
+            'Rating glovo': ['80%'] * n_rows,
+            'Rating google': [4.0] * n_rows,
+            'Latitude': [35.76] * n_rows,
+            'Longitude': [-5.83] * n_rows,
+        }).to_csv(self.input_path, index=False)
+
+    def test_preprocess_data_chunked(self):
+        """Prices, ratings and missing coordinates are handled as in preprocess_data."""
+        pd.DataFrame({
+            'Restaurant': ['R1', 'R2', 'R3', 'R4', 'R5', 'R1'],
+            'Meal name': ['M1', 'M2', 'M3', 'M4', 'M5', 'M1'],
+            'Price': ['100 MAD', '200 USD', '300 MAD', '400 MAD', '--', '150 MAD'],
+            'Rating glovo': ['80%', '--', '70%', '90%', '100%', '60%'],
+            'Rating google': [np.nan, np.nan, 3.5, 4.5, 5.0, 4.0],
+            'Latitude': [34.05, 34.05, np.nan, 34.05, 34.05, 34.05],
+            'Longitude': [-6.80, -6.80, -6.80, -6.80, -6.80, -6.80]
+        }).to_csv(self.input_path, index=False)
+
+        rows = preprocess_data_chunked(self.input_path, self.processed_path, chunksize=2)
+        processed_data = pd.read_csv(self.processed_path)
+        self.assertEqual(rows, 2)
+        self.assertEqual(list(processed_data['Restaurant']), ['R1', 'R4'])
+        np.testing.assert_array_almost_equal(list(processed_data['Price']), [100.0, 400.0])
+        np.testing.assert_array_almost_equal(list(processed_data['Rating']), [0.8, (4.5 + 0.9) / 2])
+        self.assertNotIn('Rating glovo', processed_data.columns)
+
+    def test_chunk_filtered_out(self):
+        """A chunk whose prices are all filtered out doesn't stop the run."""
+        pd.DataFrame({
+            'Restaurant': ['R1', 'R2', 'R3', 'R4'],
+            'Meal name': ['M1', 'M2', 'M3', 'M4'],
+            'Price': ['100 MAD', '200 MAD', '300 USD', '400 USD'],
+            'Rating glovo': ['80%', '90%', '70%', '60%'],
+            'Rating google': [4.0, 4.5, 3.5, 5.0],
+            'Latitude': [34.05] * 4,
+            'Longitude': [-6.80] * 4
+        }).to_csv(self.input_path, index=False)
+
+        rows = preprocess_data_chunked(self.input_path, self.processed_path, chunksize=2)
+        self.assertEqual(rows, 2)
+        self.assertEqual(list(pd.read_csv(self.processed_path)['Restaurant']), ['R1', 'R2'])
+
+    def test_empty_input(self):
+        pd.DataFrame(columns=['Restaurant', 'Meal name', 'Price', 'Rating glovo', 'Rating google',
+                              'Latitude', 'Longitude']).to_csv(self.input_path, index=False)
+        self.assertEqual(preprocess_data_chunked(self.input_path, self.processed_path, chunksize=2), 0)
+
+    def test_missing_coordinates_placeholder(self):
+        """'--' coordinates are treated as missing, as in preprocess_data."""
+        pd.DataFrame({
+            'Restaurant': ['R1', 'R2', 'R3'],
+            'Meal name': ['M1', 'M2', 'M3'],
+            'Price': ['100 MAD'] * 3,
+            'Rating glovo': ['80%'] * 3,
+            'Rating google': [4.0] * 3,
+            'Latitude': ['34.05', '--', '34.05'],
+            'Longitude': ['-6.80', '-6.80', '--']
+        }).to_csv(self.input_path, index=False)
+
+        rows = preprocess_data_chunked(self.input_path, self.processed_path, chunksize=2)
+        self.assertEqual(rows, 1)
+        self.assertEqual(list(pd.read_csv(self.processed_path)['Restaurant']), ['R1'])
+
+    def test_first_occurrence_missing_coordinates(self):
+        """A pair whose first occurrence has no coordinates is kept from a later valid row."""
+        pd.DataFrame({
+            'Restaurant': ['R1', 'R2', 'R1', 'R1'],
+            'Meal name': ['M1', 'M2', 'M1', 'M1'],
+            'Price': ['100 MAD', '200 MAD', '150 MAD', '120 MAD'],
+            'Rating glovo': ['80%'] * 4,
+            'Rating google': [4.0] * 4,
+            'Latitude': ['--', '34.05', '--', '34.05'],
+            'Longitude': ['--', '-6.80', '-6.80', '-6.80']
+        }).to_csv(self.input_path, index=False)
+
+        rows = preprocess_data_chunked(self.input_path, self.processed_path, chunksize=2)
+        processed_data = pd.read_csv(self.processed_path)
+        self.assertEqual(rows, 2)
+        self.assertEqual(list(processed_data['Restaurant']), ['R2', 'R1'])
+        self.assertEqual(list(processed_data['Price']), [200.0, 120.0])
+
+    def test_deduplication_across_chunk_dtypes(self):
+        """Keys inferred as numbers in one chunk and as text in another are still deduplicated."""
+        pd.DataFrame({
+            'Restaurant': ['R1', 'R1', 'R1', 'R1'],
+            'Meal name': ['123', '456', '123', 'Tacos'],
+            'Price': ['100 MAD'] * 4,
+            'Rating glovo': ['80%'] * 4,
+            'Rating google': [4.0] * 4,
+            'Latitude': [34.05] * 4,
+            'Longitude': [-6.80] * 4
+        }).to_csv(self.input_path, index=False)
+
+        self.assertEqual(preprocess_data_chunked(self.input_path, self.processed_path, chunksize=2), 3)
+        final_path = os.path.join(self.tmp_dir.name, 'final_dataset.csv')
+        self.input_path, self.processed_path = self.processed_path, final_path
+        with open(self.input_path, 'a') as f:
+            f.write('R1,456,100.0,34.05,-6.8,0.8\n')  # Duplicate in a chunk where 'Meal name' looks numeric
+        rows = classify_meals_chunked(self.input_path, final_path, CATEGORIES_PATH, chunksize=2)
+        self.assertEqual(rows, 3)
+
+    def test_deduplication_across_chunks(self):
+        """A (Restaurant, Meal name) pair is only written once, whichever chunk it appears in."""
+        self.write_input(5000, n_meals=300)
+        rows = preprocess_data_chunked(self.input_path, self.processed_path, chunksize=128)
+        processed_data = pd.read_csv(self.processed_path)
+        self.assertEqual(rows, 300)
+        self.assertFalse(processed_data.duplicated(subset=['Restaurant', 'Meal name']).any())
+
+    def test_classify_meals_chunked(self):
+        self.write_input(500, n_meals=100)
+        preprocess_data_chunked(self.input_path, self.processed_path, chunksize=64)
+        final_path = os.path.join(self.tmp_dir.name, 'final_dataset.csv')
+        rows = classify_meals_chunked(self.processed_path, final_path, CATEGORIES_PATH, chunksize=32)
+        final_data = pd.read_csv(final_path)
+        self.assertEqual(rows, 100)
+        self.assertIn('Category', final_data.columns)
+        self.assertFalse(final_data['Category'].isna().any())
+
+    def peak_memory(self, n_rows, chunksize, n_meals=1000):
+        self.write_input(n_rows, n_meals)
+        tracemalloc.start()
+        preprocess_data_chunked(self.input_path, self.processed_path, chunksize=chunksize)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak
+
+    def test_peak_memory_is_flat(self):
+        """Peak memory depends on the chunk size, not on the size of the input."""
+        small_peak = self.peak_memory(20000, chunksize=2000)
+        large_peak = self.peak_memory(80000, chunksize=2000)
+        self.assertLess(large_peak, 1.5 * small_peak)
+
+    def test_memory_per_distinct_pair(self):
+        """Each distinct (Restaurant, Meal name) pair costs a few bytes, not a Python object."""
+        small_peak = self.peak_memory(20000, chunksize=2000, n_meals=20000)
+        large_peak = self.peak_memory(80000, chunksize=2000, n_meals=80000)
+        self.assertLess((large_peak - small_peak) / 60000, 32)
+
 if __name__ == '__main__':
     unittest.main()
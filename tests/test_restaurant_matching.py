@@ -0,0 +1,87 @@
+import unittest
+import sys
+import os
+import pandas as pd
+import numpy as np
+
+# Append the directory of your helpers module to Python's search path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sample')))
+from restaurant_matching import normalize_name, is_compatible, build_name_index, match_restaurants, evaluate_matching, PLACE_COLUMNS
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'restaurant_matches.csv')
+KNOWN_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'known_restaurants.csv')
+
+def known_places(names):
+    """Builds a DataFrame of known places with dummy Google Maps data."""
+    places = pd.DataFrame({'Restaurant': names})
+    for column in PLACE_COLUMNS:
+        places[column] = np.arange(len(names))
+    return places
+
+class TestRestaurantMatching(unittest.TestCase):
+
+    def setUp(self):
+        self.labelled = pd.read_csv(FIXTURE_PATH, sep=';')
+        self.name_index = build_name_index(known_places(pd.read_csv(KNOWN_PATH)['Restaurant']))
+
+    def test_normalize_name(self):
+        self.assertEqual(normalize_name("Pâtisserie Al-Jawda"), 'patisserie al jawda')
+        self.assertEqual(normalize_name("MC DONALD'S - Tanger"), 'mc donalds tanger')
+        self.assertEqual(normalize_name("Restaurant Le Saveur du Poisson"), 'saveur poisson')
+        self.assertEqual(normalize_name("Restaurant"), 'restaurant')
+
+    def test_is_compatible(self):
+        self.assertTrue(is_compatible('mc donalds tanger ville', 'mcdonalds tanger ville'))
+        self.assertTrue(is_compatible('mcdonalds tanger ville', 'mc donalds tanger ville'))
+        self.assertTrue(is_compatible('k f c city mall', 'kfc tanger city mall', city='Tanger'))
+        self.assertTrue(is_compatible('tacos lyon tanger', 'tacos lyon', city='Tanger'))
+        self.assertFalse(is_compatible('tacos lyon tanger', 'tacos lyon'))
+        self.assertFalse(is_compatible('burger king tanger centre', 'burger king tanger marina'))
+
+    def test_is_compatible_whole_words(self):
+        """Words are compared whole, not as parts of longer words."""
+        self.assertFalse(is_compatible('dar', 'dar hamid'))
+        self.assertFalse(is_compatible('tacos', 'otacos tanger', city='Tanger'))
+        self.assertFalse(is_compatible('hamid', 'darhamid'))
+
+    def test_generic_name_not_matched(self):
+        """A generic name isn't resolved to one of the branches it could be."""
+        matches = match_restaurants(["McDonald's", 'KFC Tanger', 'Burger King Tanger', 'Tacos'],
+                                    self.name_index, city='Tanger')
+        self.assertTrue(matches['Matched restaurant'].isna().all())
+
+    def test_ambiguous_name_not_matched(self):
+        """A name compatible with several known restaurants is left to the Places API."""
+        name_index = build_name_index(known_places(['Dar Hamid', 'Restaurant Dar Hamid', 'La Giralda']))
+        matches = match_restaurants(['Dar Hamid', 'Giralda'], name_index, city='Tanger')
+        self.assertTrue(pd.isna(matches.loc[0, 'Matched restaurant']))
+        self.assertEqual(matches.loc[1, 'Matched restaurant'], 'La Giralda')
+
+    def test_other_branch_not_matched(self):
+        """Another branch of a known chain is left to the Places API, even when the names are close."""
+        matches = match_restaurants(['Burger King Tanger Centre', 'KFC Marjane'], self.name_index, city='Tanger')
+        self.assertGreater(matches.loc[0, 'Similarity'], 0.8)
+        self.assertTrue(pd.isna(matches.loc[0, 'Matched restaurant']))
+        self.assertEqual(matches.loc[1, 'Matched restaurant'], 'KFC Tanger Marjane')
+
+    def test_match_restaurants(self):
+        matches = match_restaurants(['Cafe Hafa', 'Kebab House'], self.name_index)
+        self.assertEqual(matches.loc[0, 'Matched restaurant'], 'Café Hafa')
+        self.assertAlmostEqual(matches.loc[0, 'Similarity'], 1.0)
+        self.assertTrue(pd.isna(matches.loc[1, 'Matched restaurant']))
+
+    def test_match_restaurants_in_batches(self):
+        """Batching the names doesn't change the matches."""
+        names = self.labelled['Restaurant']
+        pd.testing.assert_frame_equal(match_restaurants(names, self.name_index, batch_size=7),
+                                      match_restaurants(names, self.name_index))
+
+    def test_evaluate_matching(self):
+        """Accuracy and throughput on the labelled fixture set."""
+        report = evaluate_matching(self.labelled, self.name_index, city='Tanger')
+        self.assertEqual(report['names'], len(self.labelled))
+        self.assertGreaterEqual(report['accuracy'], 0.95)
+        self.assertGreater(report['throughput'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
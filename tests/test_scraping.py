@@ -9,16 +9,17 @@ import numpy as np
 # Append the directory of your helpers module to Python's search path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sample')))
 from scraping import scrape_glovo, extract_googleMaps
+from restaurant_matching import build_name_index
 
 class TestScraping(unittest.TestCase):
 
-    @patch('scraping.requests.Session.get')
+    @patch('requests.Session.get')
     def test_scrape_glovo(self, mock_get):
         mock_get.return_value.text = '<div class="store-card"></div>'
         df = scrape_glovo('test_city')
         self.assertTrue(isinstance(df, pd.DataFrame))
 
-    @patch('scraping.googlemaps.Client')
+    @patch('googlemaps.Client')
     def test_extract_googleMaps(self, mock_client):
         # Setup the mock client and its return values
         mock_places = mock_client.return_value.places
@@ -30,5 +31,18 @@ class TestScraping(unittest.TestCase):
         self.assertIsNotNone(df)
         self.assertEqual(df.iloc[0]['Address'], '123 Test St')
 
+    @patch('googlemaps.Client')
+    def test_extract_googleMaps_known_restaurant(self, mock_client):
+        # Restaurants matching a known one are resolved without calling the API
+        known_places = pd.DataFrame({'Restaurant': ["McDonald's Tanger Ville"], 'Address': ['1 Known St'], 'Latitude': [35.7],
+                                     'Longitude': [-5.8], 'Rating google': [4.1], 'Number of reviews': [120]})
+        df = pd.DataFrame({'Restaurant': ['McDonalds Tanger Ville']})
+        df = extract_googleMaps(df, 'Tanger', 'fake_api_key', build_name_index(known_places))
+
+        self.assertFalse(mock_client.called)
+        self.assertEqual(df.iloc[0]['Address'], '1 Known St')
+        self.assertEqual(df.iloc[0]['Restaurant'], 'McDonalds Tanger Ville')
+        self.assertEqual(df.iloc[0]['Source'], 'Name index')
+
 if __name__ == '__main__':
     unittest.main()